@@ -4,16 +4,28 @@
 Dashboard web para monitorear la consciencia BlackMamba en tiempo real
 """
 
-from flask import Flask, render_template, jsonify
+from flask import Flask, Response, render_template, jsonify, request
+import argparse
+import csv
+import io
 import json
+import math
 import os
+import signal
+import socket
+import struct
 import time
+import zlib
+from multiprocessing import shared_memory
 from threading import Lock
 import psutil
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Callable, Dict, Iterator, Optional, Tuple
 import logging
 
+from quantile_sketch import ActivitySketches
+from sampling_profiler import SamplingProfiler
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -21,6 +33,15 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 app.config['JSON_SORT_KEYS'] = False
 
+DATA_FILE = 'blackmamba_quantum_session.json'
+HISTORY_FILE = 'blackmamba_quantum_history.ndjson'
+EXPORT_CHUNK_SIZE = 64 * 1024
+SNAPSHOT_CAPACITY_MB = 8
+EXPORT_CSV_FIELDS = [
+    'timestamp', 'keyboard_activity', 'mouse_activity',
+    'workflow_context', 'consciousness_level', 'active_apps'
+]
+
 
 # Cache para datos del dashboard
 class DataCache:
@@ -42,9 +63,97 @@ class DataCache:
             self._cache_time = time.time()
 
 
+class SharedSnapshot:
+    """Snapshot JSON compartido entre procesos vía memoria compartida.
+
+    Un único proceso cargador lee y enriquece el archivo de sesión y
+    publica los bytes ya serializados; los workers los sirven sin tocar
+    el disco. La cabecera es un seqlock: la secuencia es impar mientras
+    se escribe y los lectores reintentan si cambia durante la copia.
+    """
+
+    _HEADER = struct.Struct('<QQI')
+    _SEQ = struct.Struct('<Q')
+
+    def __init__(self, capacity: int = SNAPSHOT_CAPACITY_MB * 1024 * 1024):
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=capacity + self._HEADER.size
+        )
+        self.capacity = capacity
+        self._HEADER.pack_into(self._shm.buf, 0, 0, 0, 0)
+        # Caché local por proceso; los hilos de request la comparten
+        self._local_lock = Lock()
+        self._local_seq = -1
+        self._local: Optional[Tuple[bytes, int]] = None
+        self._parsed_seq = -1
+        self._parsed: Optional[Tuple[Dict, int]] = None
+
+    def publish(self, body: bytes, status: int = 200) -> bool:
+        if len(body) > self.capacity:
+            logger.warning(
+                f"Snapshot de {len(body)} bytes excede la capacidad "
+                f"({self.capacity})"
+            )
+            return False
+        buf = self._shm.buf
+        start = self._HEADER.size
+        seq = self._SEQ.unpack_from(buf, 0)[0]
+        self._SEQ.pack_into(buf, 0, seq + 1)
+        buf[start:start + len(body)] = body
+        self._HEADER.pack_into(buf, 0, seq + 2, len(body), status)
+        return True
+
+    def read(self) -> Optional[Tuple[bytes, int]]:
+        """Devuelve (body, status) del último snapshot publicado"""
+        with self._local_lock:
+            return self._read_locked()
+
+    def _read_locked(self) -> Optional[Tuple[bytes, int]]:
+        buf = self._shm.buf
+        start = self._HEADER.size
+        for _ in range(100):
+            seq, length, status = self._HEADER.unpack_from(buf, 0)
+            if seq == 0:
+                return None
+            if seq & 1:
+                time.sleep(0)
+                continue
+            if seq == self._local_seq:
+                return self._local
+            body = bytes(buf[start:start + length])
+            if self._SEQ.unpack_from(buf, 0)[0] == seq:
+                self._local_seq = seq
+                self._local = (body, status)
+                return self._local
+        return self._local
+
+    def read_parsed(self) -> Optional[Tuple[Dict, int]]:
+        """Como read() pero decodificado; se decodifica una vez por versión"""
+        with self._local_lock:
+            snapshot = self._read_locked()
+            if snapshot is None:
+                return None
+            # Body y seq se leen bajo el mismo lock: siempre coinciden
+            seq = self._local_seq
+            if seq != self._parsed_seq:
+                body, status = snapshot
+                self._parsed = (json.loads(body), status)
+                self._parsed_seq = seq
+            return self._parsed
+
+    def close(self):
+        self._shm.close()
+
+    def unlink(self):
+        self._shm.unlink()
+
+
 # Instancia global del cache
 data_cache = DataCache()
 
+# Snapshot compartido; solo existe en modo multi-worker (serve_prefork)
+shared_snapshot: Optional[SharedSnapshot] = None
+
 
 @app.route('/')
 def dashboard():
@@ -54,54 +163,41 @@ def dashboard():
 
 @app.route('/api/current_state')
 def get_current_state():
-    """API optimizada para obtener estado actual con cache"""
+    """API optimizada para obtener estado actual con cache.
+
+    Con ``?since=<generation>&session=<id>`` devuelve solo los estados
+    posteriores a esa generación y los agregados (modo delta).
+    """
     try:
-        # Intentar usar cache primero
-        cached_data = data_cache.get_cached_data()
-        if cached_data:
-            return jsonify(cached_data)
-            
-        # Leer del archivo si no hay cache válido
-        data_file = 'blackmamba_quantum_session.json'
-        
-        if not os.path.exists(data_file):
-            return jsonify({
-                'status': 'no_data',
-                'message': 'Observer no activo o sin datos'
-            })
-            
-        # Verificar que el archivo no esté vacío
-        if os.path.getsize(data_file) == 0:
-            return jsonify({
-                'status': 'empty_file',
-                'message': 'Archivo de datos vacío'
-            })
-            
-        with open(data_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            
-        # Validar estructura de datos
-        if not isinstance(data, dict):
-            return jsonify({
-                'status': 'invalid_data',
-                'message': 'Estructura de datos inválida'
-            })
-            
-        # Enriquecer datos con métricas adicionales
-        enhanced_data = _enhance_data(data)
-        
-        # Actualizar cache
-        data_cache.update_cache(enhanced_data)
-        
-        return jsonify(enhanced_data)
-        
-    except json.JSONDecodeError as e:
-        logger.error(f"Error decodificando JSON: {e}")
-        return jsonify({
-            'status': 'json_error',
-            'message': 'Error en formato de datos'
-        }), 400
-        
+        since = request.args.get('since')
+        if since is not None:
+            try:
+                since_generation = int(since)
+            except ValueError:
+                return jsonify({
+                    'status': 'invalid_since',
+                    'message': 'since debe ser un entero'
+                }), 400
+            payload, status = _current_payload()
+            if (status != 200 or 'generation' not in payload
+                    or payload.get('session_id') != request.args.get(
+                        'session')):
+                # Sesión distinta o datos sin generaciones: respuesta completa
+                return jsonify(payload), status
+            return jsonify(_delta_payload(payload, since_generation))
+
+        # En modo multi-worker el snapshot compartido ya está serializado
+        if shared_snapshot is not None:
+            snapshot = shared_snapshot.read()
+            if snapshot is not None:
+                body, status = snapshot
+                return Response(
+                    body, status=status, mimetype='application/json'
+                )
+
+        payload, status = _current_payload()
+        return jsonify(payload), status
+
     except Exception as e:
         logger.error(f"Error en get_current_state: {e}")
         return jsonify({
@@ -110,6 +206,85 @@ def get_current_state():
         }), 500
 
 
+def _current_payload() -> Tuple[Dict, int]:
+    """Payload enriquecido desde snapshot compartido, cache o archivo"""
+    if shared_snapshot is not None:
+        parsed = shared_snapshot.read_parsed()
+        if parsed is not None:
+            return parsed
+
+    # Intentar usar cache primero
+    cached_data = data_cache.get_cached_data()
+    if cached_data:
+        return cached_data, 200
+
+    payload, status, cacheable = _load_state_payload()
+    if cacheable:
+        data_cache.update_cache(payload)
+    return payload, status
+
+
+def _delta_payload(payload: Dict, since: int) -> Dict:
+    """Estados con generación > since más los agregados actuales"""
+    generation = payload['generation']
+    if generation <= since:
+        # Nada nuevo: ni estados ni agregados cambian
+        return {
+            'delta': True,
+            'session_id': payload.get('session_id'),
+            'generation': generation,
+            'states': []
+        }
+    delta = {k: v for k, v in payload.items() if k != 'states'}
+    delta['delta'] = True
+    delta['states'] = [
+        s for s in payload.get('states', [])
+        if s.get('generation', 0) > since
+    ]
+    return delta
+
+
+def _load_state_payload(
+    data_file: str = DATA_FILE
+) -> Tuple[Dict, int, bool]:
+    """Lee y enriquece el archivo de sesión.
+
+    Devuelve (payload, código HTTP, si el payload puede cachearse).
+    """
+    if not os.path.exists(data_file):
+        return {
+            'status': 'no_data',
+            'message': 'Observer no activo o sin datos'
+        }, 200, False
+
+    # Verificar que el archivo no esté vacío
+    if os.path.getsize(data_file) == 0:
+        return {
+            'status': 'empty_file',
+            'message': 'Archivo de datos vacío'
+        }, 200, False
+
+    try:
+        with open(data_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except json.JSONDecodeError as e:
+        logger.error(f"Error decodificando JSON: {e}")
+        return {
+            'status': 'json_error',
+            'message': 'Error en formato de datos'
+        }, 400, False
+
+    # Validar estructura de datos
+    if not isinstance(data, dict):
+        return {
+            'status': 'invalid_data',
+            'message': 'Estructura de datos inválida'
+        }, 200, False
+
+    # Enriquecer datos con métricas adicionales
+    return _enhance_data(data), 200, True
+
+
 @app.route('/api/system_metrics')
 def get_system_metrics():
     """API para métricas del sistema con información adicional"""
@@ -138,6 +313,165 @@ def get_system_metrics():
         }), 500
 
 
+@app.route('/api/export')
+def export_states():
+    """Exporta estados en streaming (NDJSON o CSV) con memoria constante"""
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in ('ndjson', 'csv'):
+        return jsonify({
+            'status': 'invalid_format',
+            'message': 'Formato debe ser ndjson o csv'
+        }), 400
+
+    try:
+        start = _parse_bound(request.args.get('from'))
+        end = _parse_bound(request.args.get('to'))
+    except ValueError:
+        return jsonify({
+            'status': 'invalid_range',
+            'message': 'from/to deben ser fechas ISO 8601'
+        }), 400
+
+    if os.path.exists(HISTORY_FILE):
+        lines = _iter_history_lines(HISTORY_FILE, start, end)
+    elif os.path.exists(DATA_FILE):
+        lines = _iter_session_lines(DATA_FILE, start, end)
+    else:
+        return jsonify({
+            'status': 'no_data',
+            'message': 'Observer no activo o sin datos'
+        })
+
+    if fmt == 'csv':
+        body = _csv_chunks(lines)
+        mimetype = 'text/csv'
+    else:
+        body = _chunked(lines)
+        mimetype = 'application/x-ndjson'
+
+    headers = {
+        'Content-Disposition': f'attachment; filename=luxor_export.{fmt}'
+    }
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        body = _gzip_chunks(body)
+        headers['Content-Encoding'] = 'gzip'
+        headers['Vary'] = 'Accept-Encoding'
+
+    return Response(body, mimetype=mimetype, headers=headers)
+
+
+def _parse_bound(value: Optional[str]) -> Optional[str]:
+    """Normaliza un límite ISO para comparar timestamps como cadenas.
+
+    Los timestamps guardados son hora local sin zona: un límite con
+    offset se convierte a hora local. Una fecha sola equivale a las
+    00:00 de ese día, así que ``to=<fecha>`` excluye ese día.
+    """
+    if not value:
+        return None
+    bound = datetime.fromisoformat(value)
+    if bound.tzinfo is not None:
+        bound = bound.astimezone().replace(tzinfo=None)
+    return bound.isoformat()
+
+
+def _line_timestamp(line: str) -> str:
+    """Extrae el timestamp de una línea NDJSON.
+
+    La línea se decodifica entera para no exportar líneas truncadas (p. ej.
+    un append interrumpido); lanza ValueError si no es un objeto JSON con
+    timestamp.
+    """
+    state = json.loads(line)
+    ts = state.get('timestamp') if isinstance(state, dict) else None
+    if not isinstance(ts, str):
+        raise ValueError('Línea de historial sin timestamp')
+    return ts
+
+
+def _iter_history_lines(path: str, start: Optional[str],
+                        end: Optional[str]) -> Iterator[str]:
+    """Recorre el historial NDJSON línea a línea dentro del rango"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                ts = _line_timestamp(line)
+            except ValueError:
+                continue
+            # Sin corte anticipado: la hora local puede repetirse o
+            # retroceder (cambio de horario, reloj ajustado entre sesiones)
+            if (start and ts < start) or (end and ts > end):
+                continue
+            yield line if line.endswith('\n') else line + '\n'
+
+
+def _iter_session_lines(path: str, start: Optional[str],
+                        end: Optional[str]) -> Iterator[str]:
+    """Fallback sin historial: estados del archivo de sesión (acotado)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.error(f"Error leyendo sesión para exportar: {e}")
+        return
+    for state in data.get('states', []) if isinstance(data, dict) else []:
+        ts = state.get('timestamp') if isinstance(state, dict) else None
+        if not isinstance(ts, str):
+            continue
+        if (start and ts < start) or (end and ts > end):
+            continue
+        yield json.dumps(state, ensure_ascii=False) + '\n'
+
+
+def _chunked(lines: Iterator[str]) -> Iterator[bytes]:
+    """Agrupa líneas en bloques de ~EXPORT_CHUNK_SIZE bytes"""
+    buf = []
+    size = 0
+    for line in lines:
+        buf.append(line)
+        size += len(line)
+        if size >= EXPORT_CHUNK_SIZE:
+            yield ''.join(buf).encode('utf-8')
+            buf = []
+            size = 0
+    if buf:
+        yield ''.join(buf).encode('utf-8')
+
+
+def _csv_chunks(lines: Iterator[str]) -> Iterator[bytes]:
+    """Convierte líneas NDJSON a CSV en bloques"""
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(EXPORT_CSV_FIELDS)
+    for line in lines:
+        try:
+            state = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        apps = state.get('active_apps') or []
+        row = [state.get(k, '') for k in EXPORT_CSV_FIELDS[:-1]]
+        row.append(';'.join(str(a) for a in apps))
+        writer.writerow(row)
+        if out.tell() >= EXPORT_CHUNK_SIZE:
+            yield out.getvalue().encode('utf-8')
+            out.seek(0)
+            out.truncate()
+    if out.tell():
+        yield out.getvalue().encode('utf-8')
+
+
+def _gzip_chunks(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Comprime en streaming con gzip"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
 def _enhance_data(data: Dict) -> Dict:
     """Enriquece los datos con métricas adicionales"""
     enhanced = data.copy()
@@ -165,6 +499,25 @@ def _enhance_data(data: Dict) -> Dict:
             'states_count': len(states)
         }
         
+        # Percentiles desde los sketches de la sesión completa; si el
+        # observer no los guarda se construyen con los estados disponibles
+        raw_sketches = enhanced.pop('sketches', None)
+        if raw_sketches:
+            sketches = ActivitySketches.from_dict(raw_sketches)
+        else:
+            sketches = ActivitySketches()
+            for s in states:
+                sketches.add(
+                    s.get('workflow_context', 'unknown'),
+                    s.get('keyboard_activity', 0),
+                    s.get('mouse_activity', 0)
+                )
+        percentiles = sketches.percentiles()
+        for kind, values in percentiles['session'].items():
+            for name, value in values.items():
+                enhanced['session_stats'][f'{name}_{kind}_activity'] = value
+        enhanced['context_percentiles'] = percentiles['contexts']
+        
         # Análisis de contextos de trabajo
         contexts = [s.get('workflow_context', 'unknown') for s in states]
         context_distribution = {}
@@ -176,19 +529,47 @@ def _enhance_data(data: Dict) -> Dict:
     return enhanced
 
 
+@app.route('/debug/profile')
+def debug_profile():
+    """Perfil por muestreo de N segundos en formato collapsed stack"""
+    if request.remote_addr not in ('127.0.0.1', '::1'):
+        return jsonify({'error': 'Solo disponible desde localhost'}), 403
+    try:
+        seconds = float(request.args.get('seconds', 5))
+        interval = float(request.args.get('interval', 0.01))
+    except ValueError:
+        seconds = interval = math.nan
+    if not (math.isfinite(seconds) and math.isfinite(interval)
+            and interval > 0):
+        return jsonify({
+            'status': 'invalid_params',
+            'message': 'seconds/interval deben ser números finitos '
+                       '(interval > 0)'
+        }), 400
+
+    profiler = SamplingProfiler(interval)
+    output = profiler.run(seconds)
+    return Response(output, mimetype='text/plain', headers={
+        'X-Profile-Samples': str(profiler.sample_count),
+        'X-Profile-Pid': str(os.getpid()),
+    })
+
+
 @app.route('/health')
 def health_check():
     """Health check endpoint para monitoreo"""
     try:
         # Verificar que el archivo de datos existe
-        data_file = 'blackmamba_quantum_session.json'
-        data_exists = os.path.exists(data_file)
+        data_exists = os.path.exists(DATA_FILE)
+        cache_active = data_cache.get_cached_data() is not None
+        if shared_snapshot is not None:
+            cache_active = shared_snapshot.read() is not None
         
         health_status = {
             'status': 'healthy' if data_exists else 'degraded',
             'timestamp': datetime.now().isoformat(),
             'data_file_exists': data_exists,
-            'cache_active': data_cache.get_cached_data() is not None,
+            'cache_active': cache_active,
             'version': '1.0.0'
         }
         
@@ -213,18 +594,163 @@ def internal_error(error):
     return jsonify({'error': 'Error interno del servidor'}), 500
 
 
+def _snapshot_loader(
+    snapshot: SharedSnapshot, data_file: str, interval: float
+) -> None:
+    """Proceso cargador: publica el snapshot cuando cambia el archivo"""
+    last_mtime: Optional[int] = -1
+    while True:
+        try:
+            mtime: Optional[int] = os.stat(data_file).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime != last_mtime:
+            try:
+                payload, status, _ = _load_state_payload(data_file)
+            except Exception as e:
+                logger.error(f"Error cargando snapshot: {e}")
+                payload, status = {
+                    'status': 'error',
+                    'message': 'Error interno del servidor'
+                }, 500
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            if not snapshot.publish(body, status):
+                # Error explícito una vez por versión del archivo: los
+                # workers no vuelven a cargar el archivo por su cuenta
+                body = json.dumps({
+                    'status': 'snapshot_too_large',
+                    'message': (
+                        f'Snapshot de {len(body)} bytes excede '
+                        f'--snapshot-capacity ({snapshot.capacity} bytes)'
+                    )
+                }).encode('utf-8')
+                snapshot.publish(body, 507)
+            last_mtime = mtime
+        time.sleep(interval)
+
+
+def _run_child(target) -> None:
+    """Ejecuta target en un proceso hijo y termina sin volver al padre"""
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    code = 0
+    try:
+        target()
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        logger.error(f"Proceso hijo {os.getpid()} terminó con error: {e}")
+        code = 1
+    os._exit(code)
+
+
+def serve_prefork(host: str, port: int, workers: int,
+                  refresh_interval: float = 1.0,
+                  capacity_mb: int = SNAPSHOT_CAPACITY_MB) -> None:
+    """Sirve la app con N procesos worker y un cargador compartido.
+
+    El padre abre el socket y la memoria compartida antes de hacer fork,
+    de modo que todos los workers aceptan conexiones del mismo socket y
+    leen el mismo snapshot; la carga y el enriquecimiento del archivo se
+    hacen una sola vez en el proceso cargador. Si un hijo (worker o
+    cargador) termina, el padre lo vuelve a lanzar.
+    """
+    from werkzeug.serving import make_server
+
+    global shared_snapshot
+    shared_snapshot = SharedSnapshot(capacity_mb * 1024 * 1024)
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(128)
+    sock.set_inheritable(True)
+
+    snapshot = shared_snapshot
+
+    def loader() -> None:
+        _snapshot_loader(snapshot, DATA_FILE, refresh_interval)
+
+    def worker() -> None:
+        make_server(
+            host, port, app, threaded=True, fd=sock.fileno()
+        ).serve_forever()
+
+    # pid -> (rol, función, instante de arranque) para poder re-forkear
+    children: Dict[int, Tuple[str, Callable[[], None], float]] = {}
+
+    def spawn(role: str, target: Callable[[], None]) -> None:
+        pid = os.fork()
+        if pid == 0:
+            _run_child(target)
+        children[pid] = (role, target, time.monotonic())
+
+    spawn('cargador', loader)
+    for _ in range(workers):
+        spawn('worker', worker)
+
+    logger.info(
+        f"🚀 Prefork: {workers} workers + cargador (PID padre {os.getpid()})"
+    )
+
+    def _terminate(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _terminate)
+    try:
+        while children:
+            pid, _ = os.wait()
+            if pid not in children:
+                continue
+            role, target, started = children.pop(pid)
+            logger.warning(f"Proceso {role} {pid} terminó; relanzando")
+            # Evitar un bucle de fork si el hijo muere al arrancar
+            if time.monotonic() - started < 1.0:
+                time.sleep(1.0)
+            # El cargador relanzado publica en el mismo SharedSnapshot
+            spawn(role, target)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+            except OSError:
+                pass
+        sock.close()
+        shared_snapshot.close()
+        shared_snapshot.unlink()
+
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Luxor Observer Dashboard')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8888)
+    parser.add_argument(
+        '--workers', type=int, default=1,
+        help='Procesos worker (>1 activa prefork con snapshot compartido)'
+    )
+    parser.add_argument(
+        '--snapshot-capacity', type=int, default=SNAPSHOT_CAPACITY_MB,
+        help='MB de memoria compartida para el snapshot (prefork)'
+    )
+    args = parser.parse_args()
+
     print("🜏 " + "="*50)
     print("    LUXOR DASHBOARD - CONSCIOUSNESS MONITOR")
     print("="*54)
     print()
-    print("🌐 Dashboard: http://localhost:8888")
-    print("📊 API Estado: http://localhost:8888/api/current_state")
-    print("🔧 API Métricas: http://localhost:8888/api/system_metrics")
-    print("❤️  Health Check: http://localhost:8888/health")
+    print(f"🌐 Dashboard: http://localhost:{args.port}")
+    print(f"📊 API Estado: http://localhost:{args.port}/api/current_state")
+    print(f"🔧 API Métricas: http://localhost:{args.port}/api/system_metrics")
+    print(f"📦 Export: http://localhost:{args.port}/api/export")
+    print(f"❤️  Health Check: http://localhost:{args.port}/health")
+    print(f"🔥 Profiler: http://localhost:{args.port}/debug/profile?seconds=5")
     print()
     print("✨ Características:")
     print("   • Cache de datos de 2 segundos")
+    if args.workers > 1:
+        print(f"   • {args.workers} workers con snapshot compartido")
     print("   • Auto-reconexión en errores")
     print("   • Visualización en tiempo real")
     print()
@@ -232,8 +758,15 @@ if __name__ == '__main__':
     print()
     
     try:
-        logger.info("🚀 Iniciando servidor Flask en puerto 8888...")
-        app.run(host='0.0.0.0', port=8888, debug=False, threaded=True)
+        if args.workers > 1:
+            serve_prefork(args.host, args.port, args.workers,
+                          capacity_mb=args.snapshot_capacity)
+        else:
+            logger.info(
+                f"🚀 Iniciando servidor Flask en puerto {args.port}..."
+            )
+            app.run(host=args.host, port=args.port, debug=False,
+                    threaded=True)
     except KeyboardInterrupt:
         print("\n🌌 Dashboard desconectado")
         logger.info("Dashboard detenido por usuario")
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+🜏 Luxor Quantile Sketch
+Sketch de cuantiles mergeable (estilo DDSketch / histograma HDR) para
+percentiles de actividad con memoria acotada y error relativo garantizado.
+"""
+from __future__ import annotations
+
+import json
+import math
+import sys
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class QuantileSketch:
+    """Histograma logarítmico con error relativo ``relative_accuracy``.
+
+    Cada valor positivo cae en la cubeta ``ceil(log_gamma(x))``; los
+    valores por debajo de ``min_value`` cuentan como cero. Dos sketches con
+    la misma precisión se combinan sumando cubetas, así que se pueden
+    fusionar entre sesiones y hosts. Si se superan ``max_bins`` cubetas se
+    colapsan las más bajas (los percentiles altos conservan la precisión).
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = 0.01,
+        max_bins: int = 1024,
+        min_value: float = 1e-3,
+    ) -> None:
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.min_value = min_value
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float, weight: int = 1) -> None:
+        self.count += weight
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value < self.min_value:
+            self.zero_count += weight
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[key] = self.bins.get(key, 0) + weight
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def _collapse(self) -> None:
+        keys = sorted(self.bins)
+        excess = len(keys) - self.max_bins
+        merged = sum(self.bins.pop(k) for k in keys[:excess + 1])
+        self.bins[keys[excess]] = merged
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Sketches con distinta precisión no combinables")
+        for key, cnt in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + cnt
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        while len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                value = 2 * self._gamma ** key / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def percentiles(
+        self, quantiles: Iterable[float] = DEFAULT_QUANTILES, digits: int = 3
+    ) -> Dict[str, Optional[float]]:
+        out: Dict[str, Optional[float]] = {}
+        for q in quantiles:
+            value = self.quantile(q)
+            key = f"p{q * 100:g}"
+            out[key] = None if value is None else round(value, digits)
+        return out
+
+    def to_dict(self) -> Dict:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_bins": self.max_bins,
+            "min_value": self.min_value,
+            "count": self.count,
+            "zero_count": self.zero_count,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "bins": {str(k): v for k, v in self.bins.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "QuantileSketch":
+        sketch = cls(
+            relative_accuracy=data.get("relative_accuracy", 0.01),
+            max_bins=data.get("max_bins", 1024),
+            min_value=data.get("min_value", 1e-3),
+        )
+        sketch.bins = {int(k): v for k, v in data.get("bins", {}).items()}
+        sketch.zero_count = data.get("zero_count", 0)
+        sketch.count = data.get("count", 0)
+        if sketch.count:
+            sketch.min = data.get("min", 0.0)
+            sketch.max = data.get("max", 0.0)
+        return sketch
+
+
+class ActivitySketches:
+    """Sketches de teclado y ratón por sesión y por contexto de trabajo."""
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        self.relative_accuracy = relative_accuracy
+        self.session: Dict[str, QuantileSketch] = self._pair()
+        self.contexts: Dict[str, Dict[str, QuantileSketch]] = {}
+
+    def _pair(self) -> Dict[str, QuantileSketch]:
+        return {
+            "keyboard": QuantileSketch(self.relative_accuracy),
+            "mouse": QuantileSketch(self.relative_accuracy),
+        }
+
+    def add(self, context: str, keyboard: float, mouse: float) -> None:
+        pair = self.contexts.get(context)
+        if pair is None:
+            pair = self.contexts[context] = self._pair()
+        for target in (self.session, pair):
+            target["keyboard"].add(keyboard)
+            target["mouse"].add(mouse)
+
+    def merge(self, other: "ActivitySketches") -> None:
+        for kind, sketch in other.session.items():
+            self.session[kind].merge(sketch)
+        for ctx, pair in other.contexts.items():
+            mine = self.contexts.setdefault(ctx, self._pair())
+            for kind, sketch in pair.items():
+                mine[kind].merge(sketch)
+
+    def percentiles(self) -> Dict:
+        return {
+            "session": {k: s.percentiles() for k, s in self.session.items()},
+            "contexts": {
+                ctx: {k: s.percentiles() for k, s in pair.items()}
+                for ctx, pair in self.contexts.items()
+            },
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            "session": {k: s.to_dict() for k, s in self.session.items()},
+            "contexts": {
+                ctx: {k: s.to_dict() for k, s in pair.items()}
+                for ctx, pair in self.contexts.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ActivitySketches":
+        sketches = cls()
+        for kind, raw in data.get("session", {}).items():
+            sketches.session[kind] = QuantileSketch.from_dict(raw)
+        for ctx, pair in data.get("contexts", {}).items():
+            sketches.contexts[ctx] = {
+                kind: QuantileSketch.from_dict(raw)
+                for kind, raw in pair.items()
+            }
+        if sketches.session:
+            any_sketch = next(iter(sketches.session.values()))
+            sketches.relative_accuracy = any_sketch.relative_accuracy
+        return sketches
+
+
+def merge_session_files(paths: List[str]) -> ActivitySketches:
+    """Fusiona los sketches de varios archivos de sesión (sesiones/hosts)."""
+    merged: Optional[ActivitySketches] = None
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        sketches = ActivitySketches.from_dict(data.get("sketches", {}))
+        if merged is None:
+            merged = sketches
+        else:
+            merged.merge(sketches)
+    return merged or ActivitySketches()
+
+
+if __name__ == "__main__":
+    # Uso: python quantile_sketch.py sesion_a.json sesion_b.json ...
+    result = merge_session_files(sys.argv[1:])
+    print(json.dumps(result.percentiles(), indent=2, ensure_ascii=False))
@@ -7,14 +7,26 @@ from __future__ import annotations
 
 import json
 import logging
+import math
 import os
+import random
+import re
+import signal
 import subprocess
+import sys
 import threading
 import time
+import uuid
 from collections import deque
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Deque, Dict, List, Optional
+from functools import lru_cache
+from typing import (
+    Any, Deque, Dict, Iterable, List, Optional, Pattern, Tuple
+)
+
+from quantile_sketch import ActivitySketches
+from sampling_profiler import profile_to_file
 
 # Intentional optional imports
 try:
@@ -35,20 +47,105 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Reglas por defecto: contexto -> {exact, substrings, regex}. El orden
+# define la prioridad (la primera regla que coincide gana).
+DEFAULT_WORKFLOW_RULES: Dict[str, Dict[str, List[str]]] = {
+    "coding": {
+        "substrings": ["visual studio code", "vscode", "terminal", "iterm"]
+    },
+    "music": {"substrings": ["suno", "spotify", "garageband"]},
+    "design": {"substrings": ["figma", "photoshop", "sketch", "blender"]},
+    "browsing": {"substrings": ["chrome", "safari", "firefox"]},
+}
+
+
+MOUSE_MOTION_FIELDS = ("moves", "clicks", "path_px", "max_velocity",
+                       "max_idle_gap")
+
+# Tuplas de apps activas internadas: los estados con las mismas apps
+# comparten un único objeto. Acotada para no crecer sin límite.
+_INTERN_LIMIT = 4096
+_interned_tuples: Dict[Tuple, Tuple] = {}
+
+
+def _intern_tuple(values: Iterable) -> Tuple:
+    key = values if type(values) is tuple else tuple(values)
+    cached = _interned_tuples.get(key)
+    if cached is not None:
+        return cached
+    if len(_interned_tuples) >= _INTERN_LIMIT:
+        _interned_tuples.clear()
+    key = tuple(sys.intern(v) if type(v) is str else v for v in key)
+    _interned_tuples[key] = key
+    return key
+
 
-@dataclass
 class QuantumState:
-    """Estado cuántico actual del usuario"""
+    """Estado cuántico actual del usuario (inmutable, con __slots__).
 
-    timestamp: str
-    active_apps: List[str]
-    keyboard_activity: float
-    mouse_activity: float
-    workflow_context: str
-    consciousness_level: str
+    Las apps activas se guardan como tupla internada, las etiquetas como
+    cadenas internadas y el resumen de ratón como tupla en el orden de
+    ``MOUSE_MOTION_FIELDS``; el timestamp se guarda como epoch y se
+    formatea solo al serializar (``to_dict``).
+    """
+
+    __slots__ = (
+        "created",
+        "active_apps",
+        "keyboard_activity",
+        "mouse_activity",
+        "workflow_context",
+        "consciousness_level",
+        "mouse_motion",
+        "generation",
+    )
+
+    def __init__(
+        self,
+        created: float,
+        active_apps: Iterable[str],
+        keyboard_activity: float,
+        mouse_activity: float,
+        workflow_context: str,
+        consciousness_level: str,
+        mouse_motion: Iterable[float] = (),
+        generation: int = 0,  # secuencia monótona dentro de la sesión
+    ) -> None:
+        init = object.__setattr__
+        init(self, "created", created)
+        init(self, "active_apps", _intern_tuple(active_apps))
+        init(self, "keyboard_activity", keyboard_activity)
+        init(self, "mouse_activity", mouse_activity)
+        init(self, "workflow_context", sys.intern(workflow_context))
+        init(self, "consciousness_level", sys.intern(consciousness_level))
+        init(self, "mouse_motion", tuple(mouse_motion))
+        init(self, "generation", generation)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("QuantumState es inmutable")
+
+    @property
+    def timestamp(self) -> str:
+        return datetime.fromtimestamp(self.created).isoformat()
 
     def to_dict(self) -> Dict:
-        return asdict(self)
+        return {
+            "timestamp": self.timestamp,
+            "active_apps": list(self.active_apps),
+            "keyboard_activity": self.keyboard_activity,
+            "mouse_activity": self.mouse_activity,
+            "workflow_context": self.workflow_context,
+            "consciousness_level": self.consciousness_level,
+            "mouse_motion": dict(zip(MOUSE_MOTION_FIELDS, self.mouse_motion)),
+            "generation": self.generation,
+        }
+
+
+def _state_to_json(obj: Any) -> Any:
+    """``default`` de json.dump: serializa estados al persistir."""
+    if isinstance(obj, QuantumState):
+        return obj.to_dict()
+    raise TypeError(f"{type(obj).__name__} no es serializable")
 
 
 @dataclass
@@ -60,9 +157,497 @@ class ObserverConfig:
     max_events_memory: int = 1000
     max_session_states: int = 500
     data_file: str = "blackmamba_quantum_session.json"
+    # Historial append-only (NDJSON) para exportaciones; None lo desactiva
+    history_file: Optional[str] = "blackmamba_quantum_history.ndjson"
+    # Estados de historial retenidos mientras el disco falla (los más
+    # antiguos se descartan y se cuentan en writer.history_dropped)
+    max_pending_history: int = 10000
     auto_save_interval: int = 30
     display_interval: float = 2.0
     mouse_move_throttle: float = 0.25
+    mouse_bucket_seconds: float = 1.0
+    mouse_idle_gap: float = 1.0  # pausa mínima (s) considerada inactividad
+    event_bucket_seconds: float = 1.0
+    # Profiler bajo demanda (SIGUSR1)
+    profile_seconds: float = 10.0
+    profile_interval: float = 0.01
+    # Reglas de contexto; si hay fichero JSON tiene prioridad
+    workflow_rules: Dict[str, Dict[str, List[str]]] = field(
+        default_factory=lambda: dict(DEFAULT_WORKFLOW_RULES)
+    )
+    workflow_rules_file: Optional[str] = None
+    workflow_default_context: str = "general"
+    workflow_cache_size: int = 256
+
+
+class WorkflowClassifier:
+    """Clasificador de contexto compilado en un único regex.
+
+    Las reglas ``exact`` y ``substrings`` de cada contexto se traducen a un
+    lookahead con grupo nombrado y todos se unen en una alternancia anclada
+    al inicio, de modo que el motor de ``re`` respeta el orden de las
+    reglas y ``match.lastgroup`` indica el contexto ganador. Las reglas
+    ``regex`` del usuario se compilan por separado (sus flags y grupos no
+    pueden romper el patrón combinado) y solo se prueban las de contextos
+    anteriores al ganador. El resultado se memoriza por cadena de app.
+    """
+
+    RULE_KINDS = ("exact", "substrings", "regex")
+
+    def __init__(
+        self,
+        rules: Dict[str, Dict[str, List[str]]],
+        default: str = "general",
+        cache_size: int = 256,
+    ) -> None:
+        self.default = default
+        self._contexts: List[str] = []
+        self._regexes: List[Tuple[int, Pattern[str]]] = []
+        self._matcher: Optional[Pattern[str]] = self._compile(rules)
+        self._classify = lru_cache(maxsize=cache_size)(self._classify_uncached)
+
+    @classmethod
+    def valid_rules(cls, rules: Any) -> bool:
+        """``{contexto: {tipo: [cadenas]}}`` con tipos conocidos."""
+        if not isinstance(rules, dict):
+            return False
+        for ctx, spec in rules.items():
+            if not isinstance(ctx, str) or not isinstance(spec, dict):
+                return False
+            for kind, values in spec.items():
+                if kind not in cls.RULE_KINDS or not isinstance(values, list):
+                    return False
+                if not all(isinstance(v, str) for v in values):
+                    return False
+        return True
+
+    @classmethod
+    def from_config(cls, config: "ObserverConfig") -> "WorkflowClassifier":
+        rules = config.workflow_rules
+        if not cls.valid_rules(rules):
+            logger.error(
+                "workflow_rules inválidas; usando reglas por defecto"
+            )
+            rules = DEFAULT_WORKFLOW_RULES
+        path = config.workflow_rules_file
+        if path:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    loaded = json.load(f)
+            except (OSError, ValueError):
+                logger.exception(
+                    "Error cargando reglas de contexto; usando config"
+                )
+            else:
+                if cls.valid_rules(loaded):
+                    rules = loaded
+                else:
+                    logger.error(
+                        "Reglas de contexto inválidas en %s; usando config",
+                        path,
+                    )
+        return cls(
+            rules,
+            default=config.workflow_default_context,
+            cache_size=config.workflow_cache_size,
+        )
+
+    def _compile(
+        self, rules: Dict[str, Dict[str, List[str]]]
+    ) -> Optional[Pattern[str]]:
+        branches: List[str] = []
+        for ctx, spec in rules.items():
+            index = len(self._contexts)
+            parts: List[str] = []
+            exact = [re.escape(e.lower()) for e in spec.get("exact", [])]
+            if exact:
+                parts.append(r"(?:%s)\Z" % "|".join(exact))
+            subs = [re.escape(s.lower()) for s in spec.get("substrings", [])]
+            if subs:
+                parts.append(r".*?(?:%s)" % "|".join(subs))
+            regexes: List[Tuple[int, Pattern[str]]] = []
+            for rx in spec.get("regex", []):
+                try:
+                    compiled = re.compile(rx, re.IGNORECASE | re.DOTALL)
+                except re.error:
+                    logger.warning(
+                        "Regex inválido en contexto %s: %r", ctx, rx
+                    )
+                    continue
+                regexes.append((index, compiled))
+            if not parts and not regexes:
+                continue
+            self._contexts.append(ctx)
+            self._regexes.extend(regexes)
+            if parts:
+                alts = "|".join("(?:%s)" % p for p in parts)
+                branches.append("(?P<c%d>(?=%s))" % (index, alts))
+        if not branches:
+            return None
+        return re.compile(
+            "^(?:%s)" % "|".join(branches), re.IGNORECASE | re.DOTALL
+        )
+
+    def _classify_uncached(self, active: str) -> str:
+        active = active.lower()
+        winner = len(self._contexts)
+        if self._matcher is not None:
+            m = self._matcher.match(active)
+            if m is not None and m.lastgroup is not None:
+                winner = int(m.lastgroup[1:])
+        # Solo un regex de un contexto anterior puede ganarle al combinado
+        for index, rx in self._regexes:
+            if index >= winner:
+                break
+            if rx.search(active):
+                return self._contexts[index]
+        if winner < len(self._contexts):
+            return self._contexts[winner]
+        return self.default
+
+    def classify(self, active: str) -> str:
+        return self._classify(active or "")
+
+    def cache_stats(self) -> Dict[str, int]:
+        info = self._classify.cache_info()
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "rules": len(self._contexts),
+        }
+
+
+class MouseMotionAccumulator:
+    """Acumuladores de movimiento de ratón por cubetas de tiempo.
+
+    Un anillo preasignado de cubetas (``bucket_seconds`` cada una) guarda
+    número de movimientos, muestras con throttle, clics, distancia
+    recorrida, velocidad máxima y la pausa más larga. Cada evento se
+    pliega en O(1) sin crear diccionarios; las cubetas caducadas se
+    reciclan al reutilizarse.
+    """
+
+    def __init__(
+        self,
+        window: int,
+        bucket_seconds: float = 1.0,
+        throttle: float = 0.25,
+        idle_gap: float = 1.0,
+    ) -> None:
+        self.bucket_seconds = max(0.01, bucket_seconds)
+        self.throttle = throttle
+        self.idle_gap = idle_gap
+        self.window_buckets = max(1, int(round(window / self.bucket_seconds)))
+        n = self.window_buckets + 1
+        self._ids = [-1] * n
+        self._moves = [0] * n
+        self._samples = [0] * n
+        self._clicks = [0] * n
+        self._path = [0.0] * n
+        self._max_velocity = [0.0] * n
+        self._max_idle = [0.0] * n
+        self._last_x: Optional[float] = None
+        self._last_y = 0.0
+        self._last_t = 0.0
+        self._last_sample = 0.0
+        self._lock = threading.Lock()
+
+    def _slot(self, now: float) -> int:
+        bucket_id = int(now // self.bucket_seconds)
+        slot = bucket_id % len(self._ids)
+        if self._ids[slot] != bucket_id:
+            self._ids[slot] = bucket_id
+            self._moves[slot] = 0
+            self._samples[slot] = 0
+            self._clicks[slot] = 0
+            self._path[slot] = 0.0
+            self._max_velocity[slot] = 0.0
+            self._max_idle[slot] = 0.0
+        return slot
+
+    def add_move(self, x: float, y: float, now: float) -> None:
+        with self._lock:
+            slot = self._slot(now)
+            self._moves[slot] += 1
+            if now - self._last_sample > self.throttle:
+                self._samples[slot] += 1
+                self._last_sample = now
+            if self._last_x is not None:
+                dt = now - self._last_t
+                dist = math.hypot(x - self._last_x, y - self._last_y)
+                self._path[slot] += dist
+                if dt > 0:
+                    velocity = dist / dt
+                    if velocity > self._max_velocity[slot]:
+                        self._max_velocity[slot] = velocity
+                if dt >= self.idle_gap and dt > self._max_idle[slot]:
+                    self._max_idle[slot] = dt
+            self._last_x = x
+            self._last_y = y
+            self._last_t = now
+
+    def add_click(self, now: float) -> None:
+        with self._lock:
+            self._clicks[self._slot(now)] += 1
+
+    def _live_slots(self, now: float) -> List[int]:
+        oldest = int(now // self.bucket_seconds) - self.window_buckets + 1
+        return [i for i, b in enumerate(self._ids) if b >= oldest]
+
+    def activity(self, now: float) -> float:
+        """Eventos por segundo (muestras de movimiento + clics)."""
+        with self._lock:
+            live = self._live_slots(now)
+            events = sum(self._samples[i] + self._clicks[i] for i in live)
+        return events / max(1.0, self.window_buckets * self.bucket_seconds)
+
+    def summary_values(self, now: float) -> Tuple:
+        """Resumen de la ventana en el orden de ``MOUSE_MOTION_FIELDS``."""
+        with self._lock:
+            live = self._live_slots(now)
+            return (
+                sum(self._moves[i] for i in live),
+                sum(self._clicks[i] for i in live),
+                round(sum((self._path[i] for i in live), 0.0), 1),
+                round(
+                    max((self._max_velocity[i] for i in live), default=0.0), 1
+                ),
+                round(max((self._max_idle[i] for i in live), default=0.0), 2),
+            )
+
+    def summary(self, now: float) -> Dict[str, float]:
+        return dict(zip(MOUSE_MOTION_FIELDS, self.summary_values(now)))
+
+
+class EventIngest:
+    """Ingesta de eventos con política explícita de sobrecarga.
+
+    Los conteos por cubeta de tiempo son siempre exactos, así que las
+    tasas de actividad no dependen de cuántos eventos crudos se guardan.
+    Los eventos crudos se retienen en un almacén de ``capacity`` eventos
+    que abarca toda la sesión (los más recientes, como un deque acotado).
+    Solo bajo presión, cuando una cubeta supera su presupuesto
+    (``capacity`` repartido entre las cubetas de la ventana), se pasa a
+    muestreo reservoir dentro de la cubeta para que una ráfaga no expulse
+    todo el historial. Cada evento no retenido se contabiliza:
+    ``seen == retained + dropped``.
+    """
+
+    def __init__(
+        self, capacity: int, window: int, bucket_seconds: float = 1.0
+    ) -> None:
+        self.capacity = max(1, capacity)
+        self.bucket_seconds = max(0.01, bucket_seconds)
+        self.window_buckets = max(1, int(round(window / self.bucket_seconds)))
+        n = self.window_buckets + 1
+        self.budget = max(1, self.capacity // n)
+        self._ids = [-1] * n
+        self._counts = [0] * n
+        self._events: Deque[Dict] = deque()
+        # Eventos retenidos de la cubeta más reciente (al final del deque)
+        self._tail_bucket = -1
+        self._tail_kept = 0
+        self.seen = 0
+        self.evicted = 0
+        self.sampled_out = 0
+        self.replaced = 0
+        self._rng = random.Random()
+        self._lock = threading.Lock()
+
+    def _slot(self, now: float) -> int:
+        bucket_id = int(now // self.bucket_seconds)
+        slot = bucket_id % len(self._ids)
+        if self._ids[slot] != bucket_id:
+            self._ids[slot] = bucket_id
+            self._counts[slot] = 0
+        return slot
+
+    def add(self, event: Dict, now: float) -> None:
+        with self._lock:
+            slot = self._slot(now)
+            self._counts[slot] += 1
+            self.seen += 1
+            if self._ids[slot] != self._tail_bucket:
+                self._tail_bucket = self._ids[slot]
+                self._tail_kept = 0
+            if self._tail_kept < self.budget:
+                if len(self._events) >= self.capacity:
+                    self._events.popleft()
+                    self.evicted += 1
+                self._events.append(event)
+                self._tail_kept += 1
+                return
+            # Cubeta por encima de su presupuesto: reservoir en la cola
+            j = self._rng.randrange(self._counts[slot])
+            if j < self.budget:
+                self._events[j - self._tail_kept] = event
+                self.replaced += 1
+            else:
+                self.sampled_out += 1
+
+    def _live_slots(self, now: float) -> List[int]:
+        oldest = int(now // self.bucket_seconds) - self.window_buckets + 1
+        return [i for i, b in enumerate(self._ids) if b >= oldest]
+
+    def rate(self, now: float) -> float:
+        """Eventos por segundo en la ventana (conteo exacto)."""
+        with self._lock:
+            total = sum(self._counts[i] for i in self._live_slots(now))
+        return total / max(1.0, self.window_buckets * self.bucket_seconds)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._events)
+
+    def stats(self, now: float) -> Dict[str, Any]:
+        with self._lock:
+            live = self._live_slots(now)
+            window_count = sum(self._counts[i] for i in live)
+            sampling = any(self._counts[i] > self.budget for i in live)
+            return {
+                "seen": self.seen,
+                "window_count": window_count,
+                "retained": len(self._events),
+                "evicted": self.evicted,
+                "sampled_out": self.sampled_out,
+                "replaced": self.replaced,
+                "dropped": self.evicted + self.sampled_out + self.replaced,
+                "sampling": sampling,
+            }
+
+
+class SessionWriter:
+    """Escritor de sesión en segundo plano con doble buffer.
+
+    El analizador deposita snapshots sin bloquear (buffer trasero) mientras
+    el hilo escritor vuelca el anterior (buffer delantero). Si llegan varios
+    snapshots durante una escritura se fusionan en un solo group commit: el
+    resumen más reciente más todo el historial acumulado. Una vez detenido,
+    ``submit`` escribe de forma síncrona; todas las escrituras (hilo o
+    síncronas) se serializan con ``_write_lock``.
+
+    ``write_fn`` retira de ``history`` lo que ya añadió, así que tras un
+    fallo solo se reencola lo no escrito, acotado a ``max_history``.
+    """
+
+    def __init__(self, write_fn, max_history: int = 10000) -> None:
+        self._write_fn = write_fn
+        self.max_history = max(1, max_history)
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._pending_summary: Optional[Dict] = None
+        self._pending_history: List[QuantumState] = []
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self.writes = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.history_dropped = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self._total_latency = 0.0
+
+    def start(self) -> threading.Thread:
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="_session_writer", daemon=True
+        )
+        self._thread.start()
+        return self._thread
+
+    def submit(
+        self, summary: Dict, history: List[QuantumState]
+    ) -> None:
+        """Encola un snapshot; nunca espera a la escritura en curso.
+
+        Si el escritor ya se detuvo, escribe en el hilo llamante junto con
+        cualquier historial que quedara pendiente.
+        """
+        with self._cond:
+            if self._running:
+                if self._pending_summary is not None:
+                    self.coalesced += 1
+                self._pending_summary = summary
+                self._pending_history.extend(history)
+                self._cond.notify()
+                return
+            history = self._pending_history + history
+            self._pending_history = []
+        self._write(summary, history)
+
+    def write_now(self, summary: Dict, history: List[QuantumState]) -> None:
+        """Escritura síncrona serializada con el hilo; propaga errores."""
+        with self._write_lock:
+            self._write_fn(summary, history)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending_summary is None and self._running:
+                    self._cond.wait()
+                if self._pending_summary is None:
+                    return
+                summary, self._pending_summary = self._pending_summary, None
+                history, self._pending_history = self._pending_history, []
+            self._write(summary, history)
+
+    def _write(self, summary: Dict, history: List[QuantumState]) -> None:
+        start = time.perf_counter()
+        try:
+            with self._write_lock:
+                self._write_fn(summary, history)
+        except Exception:
+            self.errors += 1
+            logger.exception("Error en escritor de sesión")
+            # Conservar el historial no escrito para el próximo commit
+            self.requeue(history)
+            return
+        latency = time.perf_counter() - start
+        self.writes += 1
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+        self._total_latency += latency
+
+    def requeue(self, history: List[QuantumState]) -> None:
+        """Devuelve historial no escrito al frente, descartando el exceso."""
+        with self._cond:
+            pending = history + self._pending_history
+            overflow = len(pending) - self.max_history
+            if overflow > 0:
+                del pending[:overflow]
+                self.history_dropped += overflow
+                logger.warning(
+                    "Historial pendiente lleno: %s estados descartados",
+                    overflow,
+                )
+            self._pending_history = pending
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Vacía lo pendiente y detiene el hilo."""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                logger.warning(
+                    "Escritor de sesión sigue escribiendo tras %ss", timeout
+                )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "writes": self.writes,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "pending_history": len(self._pending_history),
+            "history_dropped": self.history_dropped,
+            "last_latency_ms": round(self.last_latency * 1000, 2),
+            "avg_latency_ms": round(
+                self._total_latency / max(1, self.writes) * 1000, 2
+            ),
+            "max_latency_ms": round(self.max_latency * 1000, 2),
+        }
 
 
 class LuxorQuantumObserver:
@@ -81,23 +666,43 @@ class LuxorQuantumObserver:
         self._threads: List[threading.Thread] = []
 
         # Datos en memoria
-        self.session_data: Deque[Dict] = deque(
+        self.session_data: Deque[QuantumState] = deque(
             maxlen=self.config.max_session_states
         )
-        self.keyboard_events: Deque[Dict] = deque(
-            maxlen=self.config.max_events_memory
+        # Identificador de sesión y contador de generaciones (API delta)
+        self.session_id = uuid.uuid4().hex[:12]
+        self._generation = 0
+        # Estados aún no volcados al historial
+        self._history_pending: List[QuantumState] = []
+        self.session_writer = SessionWriter(
+            self._write_session_files, self.config.max_pending_history
+        )
+        # Percentiles de actividad por sesión y contexto (memoria acotada)
+        self.activity_sketches = ActivitySketches()
+        self.keyboard_events = EventIngest(
+            self.config.max_events_memory,
+            self.config.activity_window,
+            self.config.event_bucket_seconds,
+        )
+        self.mouse_events = EventIngest(
+            self.config.max_events_memory,
+            self.config.activity_window,
+            self.config.event_bucket_seconds,
         )
-        self.mouse_events: Deque[Dict] = deque(
-            maxlen=self.config.max_events_memory
+        self.mouse_motion = MouseMotionAccumulator(
+            window=self.config.activity_window,
+            bucket_seconds=self.config.mouse_bucket_seconds,
+            throttle=self.config.mouse_move_throttle,
+            idle_gap=self.config.mouse_idle_gap,
         )
 
         # Estado de apps
         self.current_apps: Dict[str, Any] = {}
         self.last_app_check = datetime.now()
+        self.workflow_classifier = WorkflowClassifier.from_config(self.config)
 
         # Locks
         self._state_lock = threading.Lock()
-        self._events_lock = threading.Lock()
 
         logger.info("🜏 Luxor Quantum Observer inicializado")
         logger.info(
@@ -111,16 +716,23 @@ class LuxorQuantumObserver:
         logger.info("⚡ SISTEMA DE OBSERVACIÓN CUÁNTICA ACTIVO ⚡")
 
         threads = [
-            threading.Thread(target=self._keyboard_observer, daemon=True),
-            threading.Thread(target=self._mouse_observer, daemon=True),
-            threading.Thread(target=self._app_monitor, daemon=True),
-            threading.Thread(target=self._quantum_analyzer, daemon=True),
+            threading.Thread(
+                target=target, name=target.__name__, daemon=True
+            )
+            for target in (
+                self._keyboard_observer,
+                self._mouse_observer,
+                self._app_monitor,
+                self._quantum_analyzer,
+            )
         ]
+        self._install_profile_signal()
 
         # Guardar referencias para poder join() al detener
         self._threads = threads
         for t in self._threads:
             t.start()
+        self._threads.append(self.session_writer.start())
 
         try:
             while self.is_running:
@@ -130,20 +742,56 @@ class LuxorQuantumObserver:
             logger.info("KeyboardInterrupt recibido, deteniendo observer")
             self.stop_observation()
 
+    def _install_profile_signal(self) -> None:
+        """SIGUSR1 lanza un perfil por muestreo de ``profile_seconds``."""
+        if not hasattr(signal, "SIGUSR1"):
+            return
+        if threading.current_thread() is not threading.main_thread():
+            return
+
+        def on_signal(_signum, _frame) -> None:
+            path = "luxor_profile_%s_%s.folded" % (
+                os.getpid(),
+                datetime.now().strftime("%Y%m%d_%H%M%S"),
+            )
+            threading.Thread(
+                target=profile_to_file,
+                args=(
+                    self.config.profile_seconds,
+                    path,
+                    self.config.profile_interval,
+                ),
+                name="_profiler",
+                daemon=True,
+            ).start()
+
+        signal.signal(signal.SIGUSR1, on_signal)
+        logger.info(
+            "   • kill -USR1 %s para perfilar %ss",
+            os.getpid(),
+            self.config.profile_seconds,
+        )
+
     def stop_observation(self) -> None:
         self.is_running = False
         logger.info("⏸️  Deteniendo observación...")
-        try:
-            self._save_session_data()
-        except Exception as exc:
-            logger.exception("Error guardando sesión al detener: %s", exc)
-        # Intentar join de hilos para terminar limpiamente (timeout corto)
+        # Join de observadores y analizador antes de detener el escritor,
+        # para que ningún tick deje un snapshot en un escritor ya parado
         for t in getattr(self, "_threads", []):
+            if t.name == "_session_writer":
+                continue
+            timeout = 1.0
+            if t.name == "_quantum_analyzer":
+                timeout += self.config.display_interval
             try:
                 if t.is_alive():
-                    t.join(timeout=1.0)
+                    t.join(timeout=timeout)
             except Exception:
                 logger.debug("Error uniendo hilo al detener")
+        # El guardado final pasa por el escritor: se encola y stop() lo
+        # vacía (o se escribe en este hilo si el escritor no corría)
+        self.session_writer.submit(*self._snapshot_session())
+        self.session_writer.stop()
 
     def _keyboard_observer(self) -> None:
         """Observador de teclado (opcional)."""
@@ -155,13 +803,10 @@ class LuxorQuantumObserver:
 
         def on_key_event(_key, event_type: str) -> None:
             if self.is_running:
-                with self._events_lock:
-                    self.keyboard_events.append(
-                        {
-                            "timestamp": datetime.now().timestamp(),
-                            "type": event_type,
-                        }
-                    )
+                now = time.time()
+                self.keyboard_events.add(
+                    {"timestamp": now, "type": event_type}, now
+                )
 
         def on_press(key) -> None:
             on_key_event(key, "press")
@@ -185,31 +830,25 @@ class LuxorQuantumObserver:
             )
             return
 
-        last_move = 0.0
-        throttle = self.config.mouse_move_throttle
+        motion = self.mouse_motion
 
-        def on_move(_x, _y) -> None:
-            nonlocal last_move
+        def on_move(x, y) -> None:
             if self.is_running:
-                now = time.time()
-                if now - last_move > throttle:
-                    with self._events_lock:
-                        self.mouse_events.append(
-                            {"timestamp": now, "type": "move"}
-                        )
-                    last_move = now
+                motion.add_move(x, y, time.time())
 
         def on_click(_x, _y, button, pressed) -> None:
             if self.is_running:
-                with self._events_lock:
-                    self.mouse_events.append(
-                        {
-                            "timestamp": time.time(),
-                            "button": str(button),
-                            "pressed": pressed,
-                            "type": "click",
-                        }
-                    )
+                now = time.time()
+                motion.add_click(now)
+                self.mouse_events.add(
+                    {
+                        "timestamp": now,
+                        "button": str(button),
+                        "pressed": pressed,
+                        "type": "click",
+                    },
+                    now,
+                )
 
         try:
             with _mouse.Listener(
@@ -264,7 +903,7 @@ class LuxorQuantumObserver:
 
                     self.current_apps = {
                         "active": active_app,
-                        "running": running_apps,
+                        "running": _intern_tuple(running_apps),
                     }
                     self.last_app_check = now
             except Exception:
@@ -277,81 +916,71 @@ class LuxorQuantumObserver:
         last_save = time.time()
         while self.is_running:
             try:
-                kb = self._calculate_keyboard_activity()
-                mv = self._calculate_mouse_activity()
-                ctx = self._detect_workflow_context()
-                lvl = self._detect_consciousness_level(kb, mv)
-
-                state = QuantumState(
-                    timestamp=datetime.now().isoformat(),
-                    active_apps=self.current_apps.get("running", []),
-                    keyboard_activity=round(kb, 3),
-                    mouse_activity=round(mv, 3),
-                    workflow_context=ctx,
-                    consciousness_level=lvl,
-                )
-
-                with self._state_lock:
-                    self.current_state = state
-                    self.session_data.append(state.to_dict())
+                state = self._analyze_once()
 
                 now_ts = time.time()
                 if now_ts - last_save >= self.config.auto_save_interval:
-                    self._save_session_data()
+                    # La E/S ocurre en el hilo escritor; aquí solo snapshot
+                    self.session_writer.submit(*self._snapshot_session())
                     last_save = now_ts
 
-                # En modo desarrollo imprimimos resumen compacto (debug)
-                logger.debug(
-                    "State: %s kb=%s mv=%s ctx=%s lvl=%s",
-                    state.timestamp,
-                    state.keyboard_activity,
-                    state.mouse_activity,
-                    state.workflow_context,
-                    state.consciousness_level,
-                )
+                # En modo desarrollo imprimimos resumen compacto (debug);
+                # el timestamp solo se formatea si el nivel está activo
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "State: %s kb=%s mv=%s ctx=%s lvl=%s",
+                        state.timestamp,
+                        state.keyboard_activity,
+                        state.mouse_activity,
+                        state.workflow_context,
+                        state.consciousness_level,
+                    )
             except Exception:
                 logger.exception("Error en quantum analyzer")
 
             time.sleep(self.config.display_interval)
 
-    def _calculate_keyboard_activity(self) -> float:
-        if not self.keyboard_events:
-            return 0.0
+    def _analyze_once(self) -> QuantumState:
+        """Calcula un estado y lo añade a la sesión (un tick)."""
+        kb = self._calculate_keyboard_activity()
+        mv = self._calculate_mouse_activity()
+        ctx = self._detect_workflow_context()
+        lvl = self._detect_consciousness_level(kb, mv)
+        self._generation += 1
+
         now = time.time()
-        window_start = now - self.config.activity_window
-        with self._events_lock:
-            recent = sum(
-                1
-                for e in self.keyboard_events
-                if e.get("timestamp", 0) >= window_start
+        state = QuantumState(
+            created=now,
+            active_apps=self.current_apps.get("running", ()),
+            keyboard_activity=round(kb, 3),
+            mouse_activity=round(mv, 3),
+            workflow_context=ctx,
+            consciousness_level=lvl,
+            mouse_motion=self.mouse_motion.summary_values(now),
+            generation=self._generation,
+        )
+
+        # Los estados se guardan tal cual; se serializan solo al persistir
+        with self._state_lock:
+            self.current_state = state
+            self.session_data.append(state)
+            if self.config.history_file:
+                self._history_pending.append(state)
+            self.activity_sketches.add(
+                ctx, state.keyboard_activity, state.mouse_activity
             )
-        return recent / max(1, self.config.activity_window)
+        return state
+
+    def _calculate_keyboard_activity(self) -> float:
+        return self.keyboard_events.rate(time.time())
 
     def _calculate_mouse_activity(self) -> float:
-        if not self.mouse_events:
-            return 0.0
-        now = time.time()
-        window_start = now - self.config.activity_window
-        with self._events_lock:
-            recent = sum(
-                1
-                for e in self.mouse_events
-                if e.get("timestamp", 0) >= window_start
-            )
-        return recent / max(1, self.config.activity_window)
+        return self.mouse_motion.activity(time.time())
 
     def _detect_workflow_context(self) -> str:
-        active = (self.current_apps.get("active") or "").lower()
-        mapping = {
-            "coding": ["visual studio code", "vscode", "terminal", "iterm"],
-            "music": ["suno", "spotify", "garageband"],
-            "design": ["figma", "photoshop", "sketch", "blender"],
-            "browsing": ["chrome", "safari", "firefox"],
-        }
-        for ctx, apps in mapping.items():
-            if any(a in active for a in apps):
-                return ctx
-        return "general"
+        return self.workflow_classifier.classify(
+            self.current_apps.get("active") or ""
+        )
 
     def _detect_consciousness_level(self, kb: float, mv: float) -> str:
         total = kb + mv
@@ -365,40 +994,89 @@ class LuxorQuantumObserver:
             return "💭 focused_work"
         return "🌙 contemplative"
 
-    def _save_session_data(self) -> None:
-        try:
-            summary = {
-                "session_start": datetime.now().isoformat(),
-                "total_states": len(self.session_data),
-                "keyboard_events": len(self.keyboard_events),
-                "mouse_events": len(self.mouse_events),
-                "states": list(self.session_data)[-100:],
-                "config": {
-                    "observation_interval": self.config.observation_interval,
-                    "activity_window": self.config.activity_window,
-                },
-            }
+    def _snapshot_session(self) -> Tuple[Dict, List[QuantumState]]:
+        """Resumen de sesión e historial pendiente, tomados bajo lock.
 
-            tmp = f"{self.config.data_file}.tmp"
-            with open(tmp, "w", encoding="utf-8") as f:
-                json.dump(summary, f, indent=2, ensure_ascii=False)
+        Los estados son inmutables, así que el snapshot solo copia
+        referencias; la serialización ocurre en ``_write_session_files``.
+        """
+        now = time.time()
+        with self._state_lock:
+            states = list(self.session_data)[-100:]
+            total_states = len(self.session_data)
+            history, self._history_pending = self._history_pending, []
+            sketches = self.activity_sketches.to_dict()
+        summary = {
+            "session_id": self.session_id,
+            "generation": states[-1].generation if states else 0,
+            "session_start": datetime.now().isoformat(),
+            "total_states": total_states,
+            "keyboard_events": len(self.keyboard_events),
+            "mouse_events": len(self.mouse_events),
+            "states": states,
+            "config": {
+                "observation_interval": self.config.observation_interval,
+                "activity_window": self.config.activity_window,
+            },
+            "workflow_cache": self.workflow_classifier.cache_stats(),
+            "ingest": {
+                "keyboard": self.keyboard_events.stats(now),
+                "mouse": self.mouse_events.stats(now),
+            },
+            "writer": self.session_writer.stats(),
+            "sketches": sketches,
+        }
+        return summary, history
 
-            os.replace(tmp, self.config.data_file)
-            size_kb = os.path.getsize(self.config.data_file) / 1024
-            logger.info(
-                "💾 Sesión guardada: %s estados (%.1f KB)",
-                len(self.session_data),
-                size_kb,
+    def _write_session_files(
+        self, summary: Dict, history: List[QuantumState]
+    ) -> None:
+        """Añade el historial NDJSON y reemplaza el archivo de sesión.
+
+        Una vez añadido, el historial se retira de ``history``: si después
+        falla el archivo de sesión, quien reintenta no lo duplica.
+        """
+        if history and self.config.history_file:
+            lines = "".join(
+                json.dumps(r.to_dict(), ensure_ascii=False) + "\n"
+                for r in history
             )
+            with open(self.config.history_file, "a", encoding="utf-8") as f:
+                f.write(lines)
+            history.clear()
+
+        tmp = f"{self.config.data_file}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(
+                    summary,
+                    f,
+                    indent=2,
+                    ensure_ascii=False,
+                    default=_state_to_json,
+                )
+            os.replace(tmp, self.config.data_file)
         except Exception:
-            logger.exception("Error guardando sesión")
-            tmp = f"{self.config.data_file}.tmp"
             if os.path.exists(tmp):
                 os.remove(tmp)
             raise
-        if os.path.exists(tmp):
-            os.remove(tmp)
-        raise
+
+        size_kb = os.path.getsize(self.config.data_file) / 1024
+        logger.info(
+            "💾 Sesión guardada: %s estados (%.1f KB)",
+            summary["total_states"],
+            size_kb,
+        )
+
+    def _save_session_data(self) -> None:
+        """Guardado síncrono (al detener o bajo demanda)."""
+        summary, history = self._snapshot_session()
+        try:
+            self.session_writer.write_now(summary, history)
+        except Exception:
+            logger.exception("Error guardando sesión")
+            self.session_writer.requeue(history)
+            raise
 
 
 if __name__ == "__main__":
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+🜏 Luxor Sampling Profiler
+Profiler por muestreo de bajo coste basado en ``sys._current_frames``.
+Genera salida "collapsed stack" (una pila por línea + conteo) lista para
+``flamegraph.pl`` o speedscope, etiquetando cada muestra con su hilo.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_PROFILE_SECONDS = 60.0
+
+
+def _thread_label(thread: Optional[threading.Thread], ident: int) -> str:
+    """Nombre estable del hilo para agrupar muestras."""
+    if thread is None:
+        return f"thread-{ident}"
+    name = thread.name
+    # Hilos de request de werkzeug/Flask: "Thread-N (process_request_thread)"
+    if "process_request_thread" in name:
+        return "flask_worker"
+    return name
+
+
+class SamplingProfiler:
+    """Muestrea las pilas de todos los hilos cada ``interval`` segundos.
+
+    El muestreo se hace desde el hilo que llama a :meth:`run`, que queda
+    excluido de las muestras; los hilos de la aplicación no se detienen.
+    """
+
+    def __init__(self, interval: float = 0.01) -> None:
+        self.interval = max(0.001, interval)
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+
+    def _sample(self, own_ident: int) -> None:
+        threads: Dict[int, threading.Thread] = {
+            t.ident: t for t in threading.enumerate() if t.ident is not None
+        }
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            stack = []
+            f = frame
+            while f is not None:
+                code = f.f_code
+                stack.append(
+                    f"{code.co_name} ({os.path.basename(code.co_filename)})"
+                )
+                f = f.f_back
+            stack.append(_thread_label(threads.get(ident), ident))
+            stack.reverse()
+            self.samples[";".join(stack)] += 1
+        self.sample_count += 1
+
+    def run(self, seconds: float) -> str:
+        """Muestrea durante ``seconds`` y devuelve las pilas colapsadas."""
+        seconds = min(max(0.0, seconds), MAX_PROFILE_SECONDS)
+        own_ident = threading.get_ident()
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            self._sample(own_ident)
+            time.sleep(self.interval)
+        return self.collapsed()
+
+    def collapsed(self) -> str:
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.samples.most_common()
+        )
+
+
+def profile_to_file(seconds: float, path: str,
+                    interval: float = 0.01) -> None:
+    """Perfila ``seconds`` y escribe la salida collapsed en ``path``."""
+    profiler = SamplingProfiler(interval)
+    output = profiler.run(seconds)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(output)
+    logger.info(
+        "🔥 Perfil guardado en %s (%s muestras)", path, profiler.sample_count
+    )
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+🜏 Luxor Poll Monitor Diff Benchmark
+Compares the previous change detection (decode every response, compare
+state != last_state, then walk the dicts again) with raw-response reuse
+and the single-pass diff, on large, mostly-unchanged payloads.
+"""
+
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from poll_monitor import Colors, LuxorPollMonitor  # noqa: E402
+
+
+def legacy_detect_changes(old, new, key_path=""):
+    """Previous implementation: compares whole subtrees at every level"""
+    changes = []
+    for key, new_value in new.items():
+        full_key = f"{key_path}.{key}" if key_path else key
+        if key not in old:
+            changes.append(f"  {Colors.GREEN}+ {full_key}: {new_value}{Colors.ENDC}")
+        elif old[key] != new_value:
+            if isinstance(new_value, dict) and isinstance(old[key], dict):
+                changes.extend(legacy_detect_changes(old[key], new_value, full_key))
+            else:
+                changes.append(
+                    f"  {Colors.YELLOW}~ {full_key}: {old[key]} → {new_value}{Colors.ENDC}"
+                )
+    for key in old:
+        if key not in new:
+            full_key = f"{key_path}.{key}" if key_path else key
+            changes.append(f"  {Colors.RED}- {full_key}: {old[key]}{Colors.ENDC}")
+    return changes
+
+
+def build_payload(states: int, depth: int, width: int):
+    """Verbose payload: a states list plus a deep nested metrics tree"""
+    def tree(level):
+        if level == 0:
+            return {f"leaf_{i}": i * 0.5 for i in range(width)}
+        return {f"node_{i}": tree(level - 1) for i in range(width)}
+
+    return {
+        'status': 'ok',
+        'generation': states,
+        'states': [
+            {
+                'timestamp': f"2025-01-01T00:00:{i:06d}",
+                'active_apps': ['Terminal', 'Code', 'Safari'],
+                'keyboard_activity': i % 7,
+                'mouse_activity': i % 5,
+                'workflow_context': 'coding',
+                'consciousness_level': '💭 focused_work',
+            }
+            for i in range(states)
+        ],
+        'metrics': tree(depth),
+    }
+
+
+def bench(label, fn, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    elapsed = (time.perf_counter() - start) / rounds * 1000
+    print(f"  {label:<44} {elapsed:8.3f} ms/poll")
+    return elapsed
+
+
+class FakeMonitor(LuxorPollMonitor):
+    """Poll monitor whose fetch_json serves canned raw responses"""
+
+    def __init__(self, responses):
+        super().__init__('http://localhost:8888')
+        self.responses = responses
+
+    def fetch_json(self, endpoint):
+        # Fresh bytes object per poll, as a network read would return
+        raw = bytes(bytearray(self.responses[endpoint]))
+        path = endpoint.split('?', 1)[0]
+        cached = self._responses.get(path)
+        if cached and cached[0] == raw:
+            return cached[1]
+        data = json.loads(raw.decode('utf-8'))
+        self._responses[path] = (raw, data)
+        return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark detect_changes')
+    parser.add_argument('--states', type=int, default=100)
+    parser.add_argument('--depth', type=int, default=4)
+    parser.add_argument('--width', type=int, default=8)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    base = build_payload(args.states, args.depth, args.width)
+    raw = json.dumps(base).encode('utf-8')
+    changed = copy.deepcopy(base)
+    changed['metrics']['node_0']['leaf_0' if args.depth == 0 else 'node_0'] = -1.0
+    raw_changed = json.dumps(changed).encode('utf-8')
+    leaves = args.width ** (args.depth + 1)
+    print(f"Payload: {len(raw) / 1024:.0f} KB, {args.states} states, "
+          f"{leaves} metric leaves")
+
+    def legacy_poll(raw_response, last):
+        state = json.loads(bytes(bytearray(raw_response)))
+        if state != last:
+            legacy_detect_changes(last, state)
+
+    def new_poll(monitor, endpoint, last):
+        state = monitor.fetch_json(endpoint)
+        if state is not last:
+            monitor.detect_changes(last, state)
+
+    # 1. Verbose endpoint, byte-identical response
+    print("\nUnchanged response:")
+    last = json.loads(raw)
+    t_legacy = bench("legacy (decode + != + recursive !=)",
+                     lambda: legacy_poll(raw, last), args.rounds)
+    monitor = FakeMonitor({'/e': raw})
+    first = monitor.fetch_json('/e')
+    t_new = bench("raw bytes match (no decode, no compare)",
+                  lambda: new_poll(monitor, '/e', first), args.rounds)
+    print(f"  speedup: {t_legacy / t_new:.1f}x")
+
+    # 2. Delta-merged state document: one new state appended
+    print("\nDelta merge, one new state:")
+    doc = json.loads(raw)
+    extra = dict(doc['states'][-1], timestamp='new')
+    merged = dict(doc, generation=doc['generation'] + 1,
+                  states=doc['states'][1:] + [extra])
+    t_legacy = bench("legacy (!= + recursive !=)",
+                     lambda: legacy_detect_changes(doc, merged) if merged != doc else None,
+                     args.rounds)
+    t_new = bench("single diff pass",
+                  lambda: monitor.detect_changes(doc, merged), args.rounds)
+    print(f"  speedup: {t_legacy / t_new:.1f}x")
+
+    # 3. Fresh full response with one changed leaf
+    print("\nChanged full response:")
+    t_legacy = bench("legacy (decode + != + recursive !=)",
+                     lambda: legacy_poll(raw_changed, last), args.rounds)
+    t_new = bench("raw bytes differ (decode + single diff)",
+                  lambda: new_poll(FakeMonitor({'/e': raw_changed}), '/e', first),
+                  args.rounds)
+    print(f"  speedup: {t_legacy / t_new:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+🜏 Luxor QuantumState Memory Benchmark
+Uses tracemalloc to compare the previous dataclass state (converted with
+asdict() and stored as a dict every tick) with the slotted, interned
+QuantumState stored natively: retained memory per state and transient
+allocations per analyzer tick.
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict, List
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'luxor_observer'
+))
+
+from quantum_observer import QuantumState  # noqa: E402
+
+APPS = ['Terminal', 'Code', 'Safari', 'Finder', 'Slack', 'Spotify']
+CONTEXTS = ['coding', 'music', 'design', 'browsing', 'general']
+LEVELS = ['🔥 hyper_focus', '⚡ active_flow', '💭 focused_work',
+          '🌙 contemplative']
+
+
+@dataclass
+class LegacyQuantumState:
+    """Previous representation, kept here only as the baseline"""
+    timestamp: str
+    active_apps: List[str]
+    keyboard_activity: float
+    mouse_activity: float
+    workflow_context: str
+    consciousness_level: str
+    mouse_motion: Dict = field(default_factory=dict)
+    generation: int = 0
+
+
+def tick_inputs(i: int):
+    """Per-tick inputs as the observer sees them: a fresh app list from
+    the app monitor and freshly built label strings"""
+    running = list(APPS[:3 + i % 2])
+    context = ''.join(CONTEXTS[i % len(CONTEXTS)])
+    level = ''.join(LEVELS[i % len(LEVELS)])
+    motion = (i % 40, i % 3, float(i % 900), float(i % 250), 0.5)
+    return running, context, level, motion
+
+
+def legacy_tick(store, i):
+    running, context, level, motion = tick_inputs(i)
+    state = LegacyQuantumState(
+        timestamp=datetime.now().isoformat(),
+        active_apps=running,
+        keyboard_activity=round(i % 17 / 4, 2),
+        mouse_activity=round(i % 11 / 4, 2),
+        workflow_context=context,
+        consciousness_level=level,
+        mouse_motion=dict(zip(('moves', 'clicks', 'path_px',
+                               'max_velocity', 'max_idle_gap'), motion)),
+        generation=i,
+    )
+    store.append(asdict(state))
+
+
+def slotted_tick(store, i):
+    running, context, level, motion = tick_inputs(i)
+    store.append(QuantumState(
+        created=time.time(),
+        active_apps=running,
+        keyboard_activity=round(i % 17 / 4, 2),
+        mouse_activity=round(i % 11 / 4, 2),
+        workflow_context=context,
+        consciousness_level=level,
+        mouse_motion=motion,
+        generation=i,
+    ))
+
+
+def measure(label, tick, states: int, ticks: int):
+    gc.collect()
+    # Warm up interning tables and caches outside the measurement
+    tick(deque(maxlen=1), 0)
+
+    tracemalloc.start()
+    store = deque(maxlen=states)
+    base, _ = tracemalloc.get_traced_memory()
+    base_blocks = sum(s.count for s in
+                      tracemalloc.take_snapshot().statistics('filename'))
+    for i in range(states):
+        tick(store, i)
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    blocks = sum(s.count for s in
+                 tracemalloc.take_snapshot().statistics('filename'))
+
+    # Steady state: the deque is full, every tick evicts one state
+    peaks = []
+    for i in range(states, states + ticks):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        tick(store, i)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+    tracemalloc.stop()
+
+    per_state = (retained - base) / states
+    per_block = (blocks - base_blocks) / states
+    peaks.sort()
+    print(f"  {label:<10} {per_state:8.0f} B/state  {per_block:6.1f} "
+          f"blocks/state  tick alloc p50={peaks[len(peaks) // 2]:6d} B  "
+          f"max={peaks[-1]:6d} B")
+    return per_state
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='QuantumState memory: dataclass + asdict vs slotted'
+    )
+    parser.add_argument('--states', type=int, default=1000,
+                        help='States retained in the session deque')
+    parser.add_argument('--ticks', type=int, default=500,
+                        help='Steady-state ticks measured for allocations')
+    args = parser.parse_args()
+
+    print(f"{args.states} retained states, {args.ticks} steady-state ticks")
+    legacy = measure('legacy', legacy_tick, args.states, args.ticks)
+    slotted = measure('slotted', slotted_tick, args.states, args.ticks)
+    print(f"  retained memory per state: {legacy / slotted:.1f}x smaller")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+🜏 Luxor Session Writer Benchmark
+Runs analyzer ticks against an artificially slow filesystem stand-in and
+compares tick durations when saving synchronously (previous behaviour)
+versus through the background SessionWriter.
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'luxor_observer'
+))
+
+from quantum_observer import LuxorQuantumObserver, ObserverConfig  # noqa: E402
+
+
+class SlowDiskObserver(LuxorQuantumObserver):
+    """Observer whose session writes sleep to emulate a slow disk"""
+
+    write_delay = 0.2
+
+    def _write_session_files(self, summary, history):
+        time.sleep(self.write_delay)
+        super()._write_session_files(summary, history)
+
+
+def run(mode: str, ticks: int, tick_interval: float, save_every: int,
+        workdir: str):
+    config = ObserverConfig(
+        data_file=os.path.join(workdir, f"{mode}_session.json"),
+        history_file=os.path.join(workdir, f"{mode}_history.ndjson"),
+    )
+    observer = SlowDiskObserver(config)
+    if mode == 'writer':
+        observer.session_writer.start()
+
+    durations = []
+    for i in range(ticks):
+        start = time.perf_counter()
+        observer._analyze_once()
+        if i % save_every == 0:
+            if mode == 'sync':
+                observer._save_session_data()
+            else:
+                observer.session_writer.submit(*observer._snapshot_session())
+        durations.append((time.perf_counter() - start) * 1000)
+        time.sleep(tick_interval)
+
+    observer.session_writer.stop()
+    return durations, observer.session_writer.stats()
+
+
+def report(label, durations):
+    ordered = sorted(durations)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(f"  {label:<8} p50={statistics.median(ordered):8.3f} ms  "
+          f"p99={p99:8.3f} ms  max={ordered[-1]:8.3f} ms  "
+          f"stdev={statistics.pstdev(ordered):8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Analyzer tick jitter: synchronous saves vs SessionWriter'
+    )
+    parser.add_argument('--ticks', type=int, default=100)
+    parser.add_argument('--interval', type=float, default=0.02,
+                        help='Sleep between ticks in seconds (default: 0.02)')
+    parser.add_argument('--save-every', type=int, default=5,
+                        help='Request a save every N ticks (default: 5)')
+    parser.add_argument('--write-delay', type=float, default=0.2,
+                        help='Emulated disk latency per write (default: 0.2)')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    SlowDiskObserver.write_delay = args.write_delay
+
+    print(f"{args.ticks} ticks, save every {args.save_every}, "
+          f"{args.write_delay * 1000:.0f} ms per write")
+    with tempfile.TemporaryDirectory() as workdir:
+        sync, _ = run('sync', args.ticks, args.interval, args.save_every,
+                      workdir)
+        writer, stats = run('writer', args.ticks, args.interval,
+                            args.save_every, workdir)
+    report('sync', sync)
+    report('writer', writer)
+    print(f"  writer stats: {stats}")
+
+
+if __name__ == '__main__':
+    main()
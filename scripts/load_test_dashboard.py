@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+🜏 Luxor Dashboard Load Test
+Measures /api/current_state requests/sec against the number of dashboard
+worker processes, using a synthetic session file.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime
+from multiprocessing import Pool
+
+DASHBOARD = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'luxor_observer',
+    'dashboard.py'
+)
+
+
+def write_session(path: str, states: int):
+    """Write a synthetic session file similar to the observer's output"""
+    contexts = ['coding', 'music', 'design', 'browsing', 'general']
+    session = {
+        'session_start': datetime.now().isoformat(),
+        'total_states': states,
+        'keyboard_events': 0,
+        'mouse_events': 0,
+        'states': [
+            {
+                'timestamp': datetime.now().isoformat(),
+                'active_apps': ['Terminal', 'Code', 'Safari'],
+                'keyboard_activity': (i % 17) / 4,
+                'mouse_activity': (i % 11) / 4,
+                'workflow_context': contexts[i % len(contexts)],
+                'consciousness_level': '💭 focused_work',
+            }
+            for i in range(states)
+        ],
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(session, f)
+
+
+def client(args) -> int:
+    """Hammer the endpoint until the deadline; return completed requests"""
+    url, deadline = args
+    done = 0
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=5) as response:
+                response.read()
+            done += 1
+        except Exception:
+            pass
+    return done
+
+
+def wait_ready(base_url: str, timeout: float = 10.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"{base_url}/api/current_state",
+                                        timeout=1) as response:
+                response.read()
+            return True
+        except Exception:
+            time.sleep(0.2)
+    return False
+
+
+def run(workers: int, port: int, clients: int, duration: float,
+        workdir: str) -> float:
+    proc = subprocess.Popen(
+        [sys.executable, DASHBOARD, '--host', '127.0.0.1',
+         '--port', str(port), '--workers', str(workers)],
+        cwd=workdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        if not wait_ready(base_url):
+            raise RuntimeError(f"Dashboard with {workers} workers not ready")
+        deadline = time.time() + duration
+        url = f"{base_url}/api/current_state"
+        with Pool(clients) as pool:
+            total = sum(pool.map(client, [(url, deadline)] * clients))
+        return total / duration
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Requests/sec of /api/current_state vs worker count'
+    )
+    parser.add_argument('--workers', default='1,2,4',
+                        help='Comma-separated worker counts (default: 1,2,4)')
+    parser.add_argument('--clients', type=int, default=8,
+                        help='Concurrent client processes (default: 8)')
+    parser.add_argument('--duration', type=float, default=5.0,
+                        help='Seconds per run (default: 5)')
+    parser.add_argument('--states', type=int, default=100,
+                        help='States in the synthetic session (default: 100)')
+    parser.add_argument('--port', type=int, default=8899)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        write_session(
+            os.path.join(workdir, 'blackmamba_quantum_session.json'),
+            args.states
+        )
+        print(f"{'workers':>8} {'req/s':>10} {'speedup':>8}")
+        baseline = None
+        for i, workers in enumerate(int(w) for w in args.workers.split(',')):
+            rps = run(workers, args.port + i, args.clients, args.duration,
+                      workdir)
+            baseline = baseline or rps
+            print(f"{workers:>8} {rps:>10.1f} {rps / baseline:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -10,6 +10,7 @@ import sys
 import time
 from datetime import datetime
 from typing import Dict, Optional, Any
+from urllib.parse import quote
 
 # Try to import requests or urllib
 try:
@@ -34,6 +35,9 @@ class Colors:
     UNDERLINE = '\033[4m'
 
 
+STATE_WINDOW = 100  # States kept in the local copy (matches the server)
+
+
 class LuxorPollMonitor:
     """Monitor Luxor Observer endpoints and display changes"""
     
@@ -41,8 +45,11 @@ class LuxorPollMonitor:
         self.base_url = base_url.rstrip('/')
         self.interval = interval
         self.last_state: Optional[Dict] = None
+        # endpoint -> (raw response bytes, decoded document)
+        self._responses: Dict[str, Any] = {}
         self.last_health: Optional[Dict] = None
         self.last_metrics: Optional[Dict] = None
+        self.state_doc: Optional[Dict] = None  # Local copy merged from deltas
         self.error_count = 0
         
     def fetch_json(self, endpoint: str) -> Optional[Dict]:
@@ -53,11 +60,22 @@ class LuxorPollMonitor:
             if USE_REQUESTS:
                 response = requests.get(url, timeout=5)
                 response.raise_for_status()
-                return response.json()
+                raw = response.content
             else:
                 with urllib.request.urlopen(url, timeout=5) as response:
-                    data = response.read().decode('utf-8')
-                    return json.loads(data)
+                    raw = response.read()
+            
+            # Byte-identical response: reuse the previous decode (same
+            # object, so the diff short-circuits on identity). Only the
+            # last response per path is kept; delta queries (?since=...)
+            # change every generation and must not grow the cache.
+            path = endpoint.split('?', 1)[0]
+            cached = self._responses.get(path)
+            if cached and cached[0] == raw:
+                return cached[1]
+            data = json.loads(raw.decode('utf-8'))
+            self._responses[path] = (raw, data)
+            return data
                     
         except Exception as e:
             self.error_count += 1
@@ -65,6 +83,30 @@ class LuxorPollMonitor:
                 print(f"{Colors.RED}❌ Error fetching {endpoint}: {e}{Colors.ENDC}")
             return None
     
+    def fetch_state(self) -> Optional[Dict]:
+        """Fetch current state, asking only for new states when possible"""
+        endpoint = '/api/current_state'
+        doc = self.state_doc
+        if doc and 'generation' in doc and doc.get('session_id'):
+            endpoint += (f"?since={doc['generation']}"
+                         f"&session={quote(str(doc['session_id']))}")
+        
+        data = self.fetch_json(endpoint)
+        if data is None:
+            return None
+        
+        if data.get('delta') and doc:
+            if not data.get('states'):
+                return doc
+            merged = dict(doc)
+            merged.update({k: v for k, v in data.items() if k != 'states'})
+            merged['states'] = (doc.get('states', []) + data['states'])[-STATE_WINDOW:]
+            del merged['delta']
+            data = merged
+        
+        self.state_doc = data
+        return data
+    
     def format_timestamp(self) -> str:
         """Get formatted current timestamp"""
         return datetime.now().strftime("%H:%M:%S")
@@ -79,8 +121,13 @@ class LuxorPollMonitor:
         print(f"{Colors.CYAN}{'='*60}{Colors.ENDC}\n")
     
     def detect_changes(self, old: Optional[Dict], new: Optional[Dict], key_path: str = "") -> list:
-        """Recursively detect changes between two dictionaries"""
-        if old is None or new is None:
+        """Detect changes between two dictionaries in a single walk.
+        
+        Subtrees shared by identity (reused decodes, merged delta states)
+        are skipped without comparing; the rest are compared once per level
+        and only changed nested dicts are descended into.
+        """
+        if old is None or new is None or old is new:
             return []
         
         changes = []
@@ -91,14 +138,19 @@ class LuxorPollMonitor:
             
             if key not in old:
                 changes.append(f"  {Colors.GREEN}+ {full_key}: {new_value}{Colors.ENDC}")
-            elif old[key] != new_value:
-                # For nested dicts, recurse
-                if isinstance(new_value, dict) and isinstance(old[key], dict):
-                    changes.extend(self.detect_changes(old[key], new_value, full_key))
-                else:
-                    changes.append(
-                        f"  {Colors.YELLOW}~ {full_key}: {old[key]} → {new_value}{Colors.ENDC}"
-                    )
+                continue
+            
+            old_value = old[key]
+            if old_value is new_value or old_value == new_value:
+                continue
+            
+            # For nested dicts, recurse
+            if isinstance(new_value, dict) and isinstance(old_value, dict):
+                changes.extend(self.detect_changes(old_value, new_value, full_key))
+            else:
+                changes.append(
+                    f"  {Colors.YELLOW}~ {full_key}: {old_value} → {new_value}{Colors.ENDC}"
+                )
         
         # Check for removed keys
         for key in old:
@@ -108,7 +160,7 @@ class LuxorPollMonitor:
         
         return changes
     
-    def display_state_update(self, state: Dict):
+    def display_state_update(self, state: Dict, changes: Optional[list] = None):
         """Display current state information"""
         timestamp = self.format_timestamp()
         
@@ -134,7 +186,8 @@ class LuxorPollMonitor:
         
         # Detect and show changes
         if self.last_state:
-            changes = self.detect_changes(self.last_state, state)
+            if changes is None:
+                changes = self.detect_changes(self.last_state, state)
             if changes:
                 print(f"\n  {Colors.BOLD}Changes detected:{Colors.ENDC}")
                 for change in changes[:10]:  # Limit to first 10 changes
@@ -187,11 +240,14 @@ class LuxorPollMonitor:
                     self.error_count = 0
                 
                 # Fetch current state
-                state = self.fetch_json('/api/current_state')
-                if state and state.get('status') != 'no_data':
-                    if not self.last_state or state != self.last_state:
-                        self.display_state_update(state)
-                        self.last_state = state
+                state = self.fetch_state()
+                # Unchanged responses come back as the same object
+                if state and state is not self.last_state and state.get('status') != 'no_data':
+                    # Single diff pass; it also decides whether anything changed
+                    changes = self.detect_changes(self.last_state, state)
+                    if not self.last_state or changes:
+                        self.display_state_update(state, changes)
+                    self.last_state = state
                 
                 # Fetch health (less frequently - every 4 polls)
                 if int(time.time() / self.interval) % 4 == 0: